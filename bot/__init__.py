@@ -355,6 +355,9 @@ QUEUE_DOWNLOAD = '' if len(QUEUE_DOWNLOAD) == 0 else int(QUEUE_DOWNLOAD)
 QUEUE_UPLOAD = environ.get('QUEUE_UPLOAD', '')
 QUEUE_UPLOAD = '' if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+DDL_UPLOAD_CONCURRENCY = environ.get('DDL_UPLOAD_CONCURRENCY', '')
+DDL_UPLOAD_CONCURRENCY = 4 if len(DDL_UPLOAD_CONCURRENCY) == 0 else int(DDL_UPLOAD_CONCURRENCY)
+
 INCOMPLETE_TASK_NOTIFIER = environ.get('INCOMPLETE_TASK_NOTIFIER', '')
 INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == 'true'
 
@@ -673,6 +676,7 @@ config_dict = {'ANIME_TEMPLATE': ANIME_TEMPLATE,
                'QUEUE_ALL': QUEUE_ALL,
                'QUEUE_DOWNLOAD': QUEUE_DOWNLOAD,
                'QUEUE_UPLOAD': QUEUE_UPLOAD,
+               'DDL_UPLOAD_CONCURRENCY': DDL_UPLOAD_CONCURRENCY,
                'RCLONE_FLAGS': RCLONE_FLAGS,
                'RCLONE_PATH': RCLONE_PATH,
                'RCLONE_SERVE_URL': RCLONE_SERVE_URL,
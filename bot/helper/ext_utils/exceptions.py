@@ -15,4 +15,14 @@ class RssShutdownException(Exception):
 
 class TgLinkException(Exception):
     """No Access granted for this chat"""
-    pass
\ No newline at end of file
+    pass
+
+
+class TransientUploadError(Exception):
+    """Upload failed for a reason that may go away on retry (5xx, 408, 429)"""
+    pass
+
+
+class PermanentUploadError(Exception):
+    """Upload was rejected by the server, retrying won't help"""
+    pass
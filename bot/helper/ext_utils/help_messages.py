@@ -502,6 +502,7 @@ default_desp = {'AS_DOCUMENT': 'Default type of Telegram file upload. Default is
                 'QUEUE_ALL': 'Number of parallel tasks of downloads and uploads. For example if 20 task added and QUEUE_ALL is 8, then the summation of uploading and downloading tasks are 8 and the rest in queue. Int. NOTE: if you want to fill QUEUE_DOWNLOAD or QUEUE_UPLOAD, then QUEUE_ALL value must be greater than or equal to the greatest one and less than or equal to summation of QUEUE_UPLOAD and QUEUE_DOWNLOAD',
                 'QUEUE_DOWNLOAD': 'Number of all parallel downloading tasks. Int',
                 'QUEUE_UPLOAD': 'Number of all parallel uploading tasks. Int',
+                'DDL_UPLOAD_CONCURRENCY': 'Number of DDL servers a single task uploads to at the same time. Default is 4. Int',
                 'RCLONE_FLAGS': 'key:value|key|key|key:value . Check here all RcloneFlags.',
                 'RCLONE_PATH': "Default rclone path to which you want to upload all the mirrors using rclone.",
                 'RCLONE_SERVE_URL': 'Valid URL where the bot is deployed to use rclone serve. Format of URL should be http://myip, where myip is the IP/Domain(public) of your bot or if you have chosen port other than 80 so write it in this format http://myip:port (http and not https)',
@@ -1,38 +1,182 @@
 #!/usr/bin/env python3
-from pathlib import Path
 from traceback import format_exc
-from json import JSONDecodeError
-from io import BufferedReader
-from re import findall as re_findall
-from aiofiles.os import path as aiopath
-from time import time
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
-from aiohttp import ClientSession, ClientTimeout
-from aiohttp.client_exceptions import ContentTypeError
-
-from bot import LOGGER, user_data
+from collections import deque
+from dataclasses import dataclass
+from stat import S_ISREG
+from queue import SimpleQueue, Empty
+from asyncio import gather, create_task, current_task, Queue, Semaphore, TimeoutError
+from orjson import loads as json_loads, JSONDecodeError
+from os import path as ospath, stat as osstat
+from aiofiles import open as aiopen
+from aiofiles.os import stat as aiostat
+from time import monotonic
+from tenacity import retry, wait_random_exponential, stop_after_attempt, retry_if_exception_type
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, FormData, ClientConnectionError
+from aiohttp.payload import AsyncIterablePayload
+
+from bot import LOGGER, user_data, config_dict
 from bot.helper.mirror_utils.upload_utils.ddlserver.gofile import Gofile
 from bot.helper.mirror_utils.upload_utils.ddlserver.streamtape import Streamtape
 from bot.helper.mirror_utils.upload_utils.ddlserver.pixeldrain import PixelDrain
 from bot.helper.mirror_utils.upload_utils.ddlserver.buzzheavier import BuzzHeavier
 from bot.helper.mirror_utils.upload_utils.ddlserver.ranoz import Ranoz
+from bot.helper.ext_utils.bot_utils import sync_to_async
 from bot.helper.ext_utils.fs_utils import get_mime_type
-from bot.helper.mirror_utils.upload_utils.progress_file_reader import ProgressFileReader
+from bot.helper.ext_utils.exceptions import TransientUploadError, PermanentUploadError
+
+try:
+    from os import posix_fadvise, POSIX_FADV_SEQUENTIAL
+except ImportError:
+    posix_fadvise = None
+
+
+DDL_CHUNK_SIZE = 1024 * 1024
+DDL_READ_AHEAD = 4
+
+
+class BufferPool:
+    def __init__(self, size, count):
+        self.size = size
+        self.__count = count
+        self.__queue = SimpleQueue()
+
+    def get(self):
+        try:
+            return self.__queue.get_nowait()
+        except Empty:
+            return bytearray(self.size)
+
+    def put(self, buf):
+        if self.__queue.qsize() >= self.__count():
+            return
+        try:
+            # A bytearray can't be resized while a memoryview of it is alive, i.e.
+            # while the transport still holds a chunk that hasn't hit the socket yet
+            buf.append(0)
+        except BufferError:
+            return
+        buf.pop()
+        self.__queue.put(buf)
+
+
+def pool_buffers():
+    # Read on use since DDL_UPLOAD_CONCURRENCY can be changed from bot settings at runtime.
+    # Each concurrent stream has its read-ahead queue, the chunk being read and two held back
+    return (config_dict['DDL_UPLOAD_CONCURRENCY'] or 1) * (DDL_READ_AHEAD + 3)
+
+
+buffer_pool = BufferPool(DDL_CHUNK_SIZE, pool_buffers)
+
+
+@dataclass
+class FileInfo:
+    path: str
+    name: str
+    size: int
+    is_file: bool
+
+
+def get_file_info(path, name):
+    # stat and mime sniffing both block, run them in a single executor hop
+    st = osstat(path)
+    if S_ISREG(st.st_mode):
+        return FileInfo(path, name, st.st_size, True), get_mime_type(path)
+    return FileInfo(path, name, st.st_size, False), 'Folder'
+
+
+# service: (uploader class, display name, api key -> uploader args)
+DDL_SERVICES = {
+    'gofile': (Gofile, 'GoFile', lambda api_key: (api_key,)),
+    'streamtape': (Streamtape, 'StreamTape', lambda api_key: api_key.split(':')),
+    'pixeldrain': (PixelDrain, 'PixelDrain', lambda api_key: (api_key,)),
+    'buzzheavier': (BuzzHeavier, 'BuzzHeavier', lambda api_key: (api_key,)),
+    'ranoz': (Ranoz, 'Ranoz', lambda api_key: (api_key,)),
+}
+
+
+async def read_chunks(file_path, queue):
+    try:
+        async with aiopen(file_path, 'rb') as f:
+            if posix_fadvise:
+                # Uploads read the file front to back once, let the kernel read ahead aggressively
+                posix_fadvise(f.fileno(), 0, 0, POSIX_FADV_SEQUENTIAL)
+            while True:
+                buf = buffer_pool.get()
+                if not (size := await f.readinto(buf)):
+                    buffer_pool.put(buf)
+                    break
+                await queue.put((buf, size))
+        await queue.put(None)
+    except Exception as e:
+        # A local read error won't go away on retry, keep it apart from network failures
+        await queue.put(PermanentUploadError(f"Reading {file_path} failed: {e}"))
+
+
+async def stream_file(file_path, callback):
+    # Disk reads run ahead in their own task so they overlap with the socket writes
+    queue = Queue(maxsize=DDL_READ_AHEAD)
+    reader = create_task(read_chunks(file_path, queue))
+    in_flight = deque()
+    try:
+        while (item := await queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            buf, size = item
+            in_flight.append(buf)
+            callback(size)
+            yield memoryview(buf)[:size]
+            if len(in_flight) > 2:
+                buffer_pool.put(in_flight.popleft())
+    finally:
+        reader.cancel()
+        while in_flight:
+            buffer_pool.put(in_flight.popleft())
+        while not queue.empty():
+            if isinstance(item := queue.get_nowait(), tuple):
+                buffer_pool.put(item[0])
+
+
+class FilePayload(AsyncIterablePayload):
+    # Known size lets aiohttp send a plain Content-Length body instead of chunked encoding
+    def __init__(self, file_path, file_size, callback):
+        super().__init__(stream_file(file_path, self.__on_chunk))
+        self._size = file_size
+        self.sent = 0
+        self.__callback = callback
+
+    def __on_chunk(self, chunk_size):
+        self.sent += chunk_size
+        self.__callback(chunk_size)
+
+
+def upload_timeout(file_size):
+    # Overall budget scales with the file at a ~1 Mbps floor instead of a flat limit.
+    # sock_read only starts once the body is sent, so it bounds the wait for the server's reply
+    return ClientTimeout(total=max(60, file_size / (128 * 1024)), sock_connect=10, sock_read=300)
+
+
+def upload_not_cancelled(retry_state):
+    # Closing the session on cancel fails the request with a connection error, don't retry that
+    return not retry_state.args[0].is_cancelled
 
 
 class DDLUploader:
     def __init__(self, listener=None, name=None, path=None):
         self.name = name
         self.__processed_bytes = 0
-        self.last_uploaded = 0
         self.__listener = listener
         self.__path = path
-        self.__start_time = time()
+        self.__last_tick = None
+        self.__last_chunk = None
+        self.__tick_bytes = 0
+        self.__speed = 0.0
         self.total_files = 0
         self.total_folders = 0
         self.is_cancelled = False
         self.__is_errored = False
         self.__ddl_servers = {}
+        self.__servers_count = 1
+        self.__service_bytes = {}
         self.__engine = 'DDL v1'
         self.__asyncSession = None
         self.__user_id = self.__listener.message.from_user.id
@@ -40,94 +184,116 @@ class DDLUploader:
     async def __user_settings(self):
         user_dict = user_data.get(self.__user_id, {})
         self.__ddl_servers = user_dict.get('ddl_servers', {})
+
+    async def get_session(self):
+        if self.is_cancelled:
+            # cancel_download() closed the session, don't open a new one behind its back
+            raise Exception('Upload has been manually cancelled!')
+        if self.__asyncSession is None or self.__asyncSession.closed:
+            self.__asyncSession = ClientSession(
+                connector=TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=75),
+                timeout=ClientTimeout(total=None, sock_connect=10, sock_read=300),
+                read_bufsize=4 * 1024 * 1024)
+        return self.__asyncSession
         
-    def __progress_callback(self, current):
-        chunk_size = current - self.last_uploaded
-        self.last_uploaded = current
+    def progress_callback(self, chunk_size):
         self.__processed_bytes += chunk_size
+        self.__tick_bytes += chunk_size
+        now = self.__last_chunk = monotonic()
+        if self.__last_tick is None:
+            # Time from the first chunk, not from the stat and upload URL lookups before it
+            self.__last_tick = now
+        elif (elapsed := now - self.__last_tick) > 0.05:
+            # Exponential moving average keeps the reported speed smooth between chunks
+            self.__speed = 0.7 * self.__speed + 0.3 * self.__tick_bytes / elapsed
+            self.__tick_bytes = 0
+            self.__last_tick = now
 
-    def _PixelDrain__progress_callback(self, current):
-        chunk_size = current - self.last_uploaded
-        self.last_uploaded = current
-        self.__processed_bytes += chunk_size
+    def discard_progress(self, payload):
+        # Bytes of a failed attempt are either sent again on retry or not at all
+        self.__processed_bytes -= payload.sent
     
-    @retry(wait=wait_exponential(multiplier=2, min=10, max=60), stop=stop_after_attempt(2),
-        retry=retry_if_exception_type((Exception,)))
-    async def upload_aiohttp(self, url, file_path, req_file, data, headers=None, method='POST'):
+    @staticmethod
+    async def __parse_response(resp, success_codes):
+        LOGGER.info(f"Upload response status: {resp.status}")
+        if resp.status in success_codes:
+            body = await resp.read()
+            try:
+                return json_loads(body)
+            except JSONDecodeError:
+                return body.decode()
+        error = f"Upload failed with status {resp.status}: {await resp.text()}"
+        LOGGER.error(error)
+        if resp.status >= 500 or resp.status in [408, 429]:
+            raise TransientUploadError(error)
+        raise PermanentUploadError(error)
+
+    # Every retry re-sends the whole file, so only retry failures that can go away on their own
+    @retry(wait=wait_random_exponential(multiplier=2, min=10, max=60), stop=stop_after_attempt(2), reraise=True,
+        retry=retry_if_exception_type((TransientUploadError, TimeoutError, ClientConnectionError)) & upload_not_cancelled)
+    async def upload_aiohttp(self, url, file_path, req_file, data, headers=None, method='POST', file_name=None, file_size=None):
         """Modified to support both POST and PUT methods with proper file handling"""
-        # Create timeout that allows for large file uploads - 2 hours total timeout
-        timeout = ClientTimeout(total=7200, connect=60, sock_read=300)
-        
-        with ProgressFileReader(filename=file_path, read_callback=self.__progress_callback) as file:
+        session = await self.get_session()
+        if file_size is None:
+            file_size = (await aiostat(file_path)).st_size
+        timeout = upload_timeout(file_size)
+        payload = FilePayload(file_path, file_size, self.progress_callback)
+        try:
             if method.upper() == 'PUT':
                 # For PUT requests (like BuzzHeavier)
-                async with ClientSession(timeout=timeout) as session:
-                    async with session.put(url, data=file, headers=headers) as resp:
-                        LOGGER.info(f"Upload response status: {resp.status}")
-                        if resp.status in [200, 201]:
-                            try:
-                                return await resp.json()
-                            except ContentTypeError:
-                                return await resp.text()
-                        else:
-                            LOGGER.error(f"Upload failed with status {resp.status}: {await resp.text()}")
-                            return None
+                headers = {**(headers or {}), 'Content-Length': str(file_size)}
+                async with session.put(url, data=payload, headers=headers, timeout=timeout) as resp:
+                    result = await self.__parse_response(resp, [200, 201])
             else:
                 # For POST requests (like GoFile)
-                data[req_file] = file
-                async with ClientSession(timeout=timeout) as session:
-                    async with session.post(url, data=data, headers=headers) as resp:
-                        LOGGER.info(f"Upload response status: {resp.status}")
-                        if resp.status == 200:
-                            try:
-                                return await resp.json()
-                            except ContentTypeError:
-                                return await resp.text()
-                        else:
-                            LOGGER.error(f"Upload failed with status {resp.status}: {await resp.text()}")
-                            return None
-
-    async def __upload_to_ddl(self, file_path):
+                form = FormData(data)
+                form.add_field(req_file, payload, filename=file_name or ospath.basename(file_path))
+                async with session.post(url, data=form, headers=headers, timeout=timeout) as resp:
+                    result = await self.__parse_response(resp, [200])
+        except BaseException as e:
+            self.discard_progress(payload)
+            if isinstance(e.__cause__, PermanentUploadError):
+                # aiohttp wraps body errors in ClientOSError, which would be retried as a network failure
+                raise e.__cause__
+            raise
+        # Each service runs in its own __upload_one task, remember what it sent in case it fails later
+        task = current_task()
+        self.__service_bytes[task] = self.__service_bytes.get(task, 0) + payload.sent
+        return result
+
+    async def __upload_one(self, serv, api_key, file_info, sem):
+        uploader, name, get_args = DDL_SERVICES[serv]
+        async with sem:
+            try:
+                return name, await uploader(self, *get_args(api_key)).upload(file_info)
+            except BaseException:
+                # Progress is averaged over the services still uploading, drop what this one already sent
+                self.__processed_bytes -= self.__service_bytes.pop(current_task(), 0)
+                self.__servers_count -= 1
+                raise
+
+    async def __upload_to_ddl(self, file_info):
         """Modified to better handle upload responses"""
         all_links = {}
         upload_errors = {}  # Track specific errors for each service
         
-        for serv, (enabled, api_key) in self.__ddl_servers.items():
-            if enabled:
-                self.total_files = 0
-                self.total_folders = 0
-                try:
-                    if serv == 'gofile':
-                        self.__engine = 'GoFile API'
-                        nlink = await Gofile(self, api_key).upload(file_path)
-                        if nlink:
-                            all_links['GoFile'] = nlink
-                    elif serv == 'streamtape':
-                        self.__engine = 'StreamTape API'
-                        login, key = api_key.split(':')
-                        nlink = await Streamtape(self, login, key).upload(file_path)
-                        if nlink:
-                            all_links['StreamTape'] = nlink
-                    elif serv == 'pixeldrain':
-                        self.__engine = 'PixelDrain API'
-                        nlink = await PixelDrain(self, api_key).upload(file_path)
-                        if nlink:
-                            all_links['PixelDrain'] = nlink
-                    elif serv == 'buzzheavier':
-                        self.__engine = 'BuzzHeavier API'
-                        nlink = await BuzzHeavier(self, api_key).upload(file_path)
-                        if nlink:
-                            all_links['BuzzHeavier'] = nlink
-                    elif serv == 'ranoz':
-                        self.__engine = 'Ranoz API'
-                        nlink = await Ranoz(self, api_key).upload(file_path)
-                        if nlink:
-                            all_links['Ranoz'] = nlink
-                    self.__processed_bytes = 0
-                except Exception as e:
-                    LOGGER.error(f"Error uploading to {serv}: {str(e)}")
-                    upload_errors[serv] = str(e)
-                    continue
+        servers = [(serv, api_key) for serv, (enabled, api_key) in self.__ddl_servers.items()
+                   if enabled and serv in DDL_SERVICES]
+        self.__servers_count = len(servers) or 1
+        if servers:
+            self.__engine = ', '.join(f"{DDL_SERVICES[serv][1]} API" for serv, _ in servers)
+        self.total_files = 0
+        self.total_folders = 0
+        # Each service is a different host, so upload to all of them at once
+        sem = Semaphore(config_dict['DDL_UPLOAD_CONCURRENCY'] or 1)
+        results = await gather(*(self.__upload_one(serv, api_key, file_info, sem) for serv, api_key in servers),
+                               return_exceptions=True)
+        for (serv, _), result in zip(servers, results):
+            if isinstance(result, BaseException):
+                LOGGER.error(f"Error uploading to {serv}: {str(result)}")
+                upload_errors[serv] = str(result)
+            elif result[1]:
+                all_links[result[0]] = result[1]
         
         if not all_links:
             # Construct a more informative error message
@@ -147,11 +313,9 @@ class DDLUploader:
         LOGGER.info(f"Uploading: {item_path} via DDL")
         await self.__user_settings()
         try:
-            if await aiopath.isfile(item_path):
-                mime_type = get_mime_type(item_path)
-            else:
-                mime_type = 'Folder'
-            link = await self.__upload_to_ddl(item_path)
+            # Stat once here, the service uploaders rely on this instead of checking the path again
+            file_info, mime_type = await sync_to_async(get_file_info, item_path, file_name)
+            link = await self.__upload_to_ddl(file_info)
             if link is None:
                 raise Exception('Upload has been manually cancelled!')
             if self.is_cancelled:
@@ -163,14 +327,17 @@ class DDLUploader:
                                                  file_name)
             LOGGER.info(f"Task Done: {file_name}")
         except Exception as err:
+            if self.is_cancelled:
+                # cancel_download() already reported it, the error here is just the closed session
+                return
             LOGGER.info("DDL Upload has been Cancelled")
-            if self.__asyncSession:
-                await self.__asyncSession.close()
             err = str(err).replace('>', '').replace('<', '')
             LOGGER.info(format_exc())
             await self.__listener.onUploadError(err)
             self.__is_errored = True
         finally:
+            if self.__asyncSession:
+                await self.__asyncSession.close()
             # Remove finally block's onUploadComplete call
             # as it's already called in try block
             if self.is_cancelled or self.__is_errored:
@@ -178,14 +345,18 @@ class DDLUploader:
 
     @property
     def speed(self):
-        try:
-            return self.__processed_bytes / int(time() - self.__start_time)
-        except ZeroDivisionError:
+        if self.__last_chunk is None:
             return 0
+        # The average only moves when a chunk is pulled. While none are (stalled socket, waiting
+        # for the reply, retry backoff) at most about one chunk can have gone out since the last one
+        idle = monotonic() - self.__last_chunk
+        speed = min(self.__speed, DDL_CHUNK_SIZE / idle) if idle > 0 else self.__speed
+        return speed / max(self.__servers_count, 1)
 
     @property
     def processed_bytes(self):
-        return self.__processed_bytes
+        # Services upload in parallel, report the average so progress stays within the file size
+        return self.__processed_bytes / max(self.__servers_count, 1)
     
     @property
     def engine(self):
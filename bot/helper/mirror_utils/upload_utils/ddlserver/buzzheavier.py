@@ -1,9 +1,4 @@
 #!/usr/bin/env python3
-from os import path as ospath
-from aiofiles.os import path as aiopath
-from aiohttp import ClientSession
-import asyncio
-
 from bot import LOGGER
 
 class BuzzHeavier:
@@ -16,37 +11,33 @@ class BuzzHeavier:
         else:
             LOGGER.warning("BuzzHeavier initialized without an API key. Some features may not work.")
 
-    async def upload_file(self, file_path):
+    async def upload_file(self, file_info):
         """Upload a single file to BuzzHeavier"""
-        LOGGER.info(f"Starting BuzzHeavier upload for: {file_path}")
-        if not await aiopath.exists(file_path):
-            raise Exception(f"File not found: {file_path}")
-        
+        LOGGER.info(f"Starting BuzzHeavier upload for: {file_info.path}")
         if self.dluploader.is_cancelled:
             LOGGER.info("Upload cancelled by user")
             return
 
-        file_name = ospath.basename(file_path)
+        file_name = file_info.name
         LOGGER.info(f"Uploading file: {file_name}")
         
         headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Connection': 'keep-alive',
-            'keep-alive': '300',
-            'Expect': '100-continue'
+            'keep-alive': '300'
         }
         
         upload_url = f"{self.api_url}/{file_name}?locationId=12brteedoy0f"
         
         try:
-            self.dluploader.last_uploaded = 0
             result = await self.dluploader.upload_aiohttp(
                 upload_url,
-                file_path,
+                file_info.path,
                 None,  # No req_file needed for PUT
                 {},     # No data needed for PUT
                 headers=headers,
-                method='PUT'
+                method='PUT',
+                file_size=file_info.size
             )
             
             if not result:
@@ -72,18 +63,12 @@ class BuzzHeavier:
             LOGGER.error(f"Error uploading to BuzzHeavier: {str(e)}")
             raise
 
-    async def upload(self, file_path):
+    async def upload(self, file_info):
         """Main upload method"""
-        LOGGER.info(f"BuzzHeavier upload called for: {file_path}")
-        
-        # Add debugging for file detection
-        exists = await aiopath.exists(file_path)
-        is_file = await aiopath.isfile(file_path)
-        is_dir = await aiopath.isdir(file_path)
-        LOGGER.info(f"BuzzHeavier file checks - Exists: {exists}, Is file: {is_file}, Is directory: {is_dir}")
+        LOGGER.info(f"BuzzHeavier upload called for: {file_info.path}")
         
-        if exists and not is_dir:
-            result = await self.upload_file(file_path)
+        if file_info.is_file:
+            result = await self.upload_file(file_info)
             LOGGER.info(f"Upload result: {result}")
             if result and result.get('downloadPage'):
                 return result['downloadPage']  # Return direct URL for DDLEngine
@@ -4,13 +4,16 @@ import logging
 from os import path as ospath
 from os import walk
 from random import choice
+from time import time
 from aiofiles.os import path as aiopath
-from aiofiles.os import rename as aiorename
 from aiohttp import ClientSession
 
 from bot import LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async
 
+# token: time until which its last successful validation is trusted
+VALID_TOKENS = {}
+
 
 class Gofile:
     def __init__(self, dluploader=None, token=None):
@@ -22,6 +25,8 @@ class Gofile:
     async def is_goapi(token):
         if token is None:
             return False
+        if VALID_TOKENS.get(token, 0) > time():
+            return True
 
         async with ClientSession() as session:
             async with session.get(
@@ -33,7 +38,9 @@ class Gofile:
                     async with session.get(
                         f"https://api.gofile.io/accounts/{acc_id}?token={token}"
                     ) as resp:
-                        return (await resp.json())["status"] == "ok"
+                        if (await resp.json())["status"] == "ok":
+                            VALID_TOKENS[token] = time() + 900
+                            return True
         return False
 
     async def __resp_handler(self, response):
@@ -111,6 +118,7 @@ class Gofile:
         password: str = "",
         tags: str = "",
         expire: str = "",
+        file_size: int = None,
     ):
         if password and len(password) < 4:
             raise ValueError("Password Length must be greater than 4")
@@ -132,30 +140,28 @@ class Gofile:
 
         if self.dluploader.is_cancelled:
             return
-        new_path = ospath.join(
-            ospath.dirname(path), ospath.basename(path).replace(" ", ".")
-        )
-        await aiorename(path, new_path)
-        self.dluploader.last_uploaded = 0
+        # Other services may be reading the same path concurrently, so only the uploaded name changes
         upload_file = await self.dluploader.upload_aiohttp(
             f"https://{server}.gofile.io/contents/uploadfile",
-            new_path,
+            path,
             "file",
             req_dict,
+            file_name=ospath.basename(path).replace(" ", "."),
+            file_size=file_size,
         )
         return await self.__resp_handler(upload_file)
 
-    async def upload(self, file_path):
+    async def upload(self, file_info):
         if not await self.is_goapi(self.token):
             raise Exception("Invalid Gofile API Key, Recheck your account !!")
         
-        if await aiopath.isfile(file_path):
-            if (gCode := await self.upload_file(path=file_path)) and gCode.get(
+        if file_info.is_file:
+            if (gCode := await self.upload_file(path=file_info.path, file_size=file_info.size)) and gCode.get(
                 "downloadPage", False
             ):
                 return gCode["downloadPage"]
-        elif await aiopath.isdir(file_path):
-            if gCode := await self.upload_folder(path=file_path):
+        else:
+            if gCode := await self.upload_folder(path=file_info.path):
                 return f"https://gofile.io/d/{gCode}"
         if self.dluploader.is_cancelled:
             return
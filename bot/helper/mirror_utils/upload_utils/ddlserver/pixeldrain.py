@@ -1,33 +1,31 @@
 #!/usr/bin/env python3
-from os import path as ospath
-from aiofiles.os import path as aiopath
-from aiohttp import ClientSession
 import base64
 
 from bot import LOGGER
-from bot.helper.mirror_utils.upload_utils.progress_file_reader import ProgressFileReader
 
 class PixelDrain:
+    # api_key: base64 Basic auth header, so each new uploader doesn't encode the key again
+    _AUTH_CACHE = {}
+
     def __init__(self, dluploader=None, api_key=None):
         self.api_url = "https://pixeldrain.com/api"
         self.dluploader = dluploader
         if not api_key:
             raise Exception("PixelDrain API Key is required! Get it from https://pixeldrain.com/api")
         self.api_key = api_key
-        self.auth_header = f"Basic {base64.b64encode(f':{api_key}'.encode()).decode()}"
+        if not (auth_header := PixelDrain._AUTH_CACHE.get(api_key)):
+            auth_header = PixelDrain._AUTH_CACHE[api_key] = f"Basic {base64.b64encode(f':{api_key}'.encode()).decode()}"
+        self.auth_header = auth_header
         LOGGER.info(f"PixelDrain initialized with API key: {api_key[:8]}...")
 
-    async def upload_file(self, file_path):
+    async def upload_file(self, file_info):
         """Upload a single file to PixelDrain"""
-        LOGGER.info(f"Starting PixelDrain upload for: {file_path}")
-        if not await aiopath.exists(file_path):
-            raise Exception(f"File not found: {file_path}")
-        
+        LOGGER.info(f"Starting PixelDrain upload for: {file_info.path}")
         if self.dluploader.is_cancelled:
             LOGGER.info("Upload cancelled by user")
             return
 
-        file_name = ospath.basename(file_path)
+        file_name = file_info.name
         LOGGER.info(f"Uploading file: {file_name}")
         
         headers = {
@@ -38,70 +36,43 @@ class PixelDrain:
         upload_url = f"{self.api_url}/file/{file_name}"
         
         try:
-            async with ClientSession() as session:
-                LOGGER.info("Starting file upload...")
-                with ProgressFileReader(filename=file_path, read_callback=self.dluploader.__progress_callback) as file:
-                    async with session.put(upload_url, data=file, headers=headers) as resp:
-                        
-                        if resp.status >= 400:
-                            try:
-                                error = await resp.json()
-                                LOGGER.error(f"PixelDrain upload failed: {error}")
-                                raise Exception(f"Upload failed: {error.get('message', 'Unknown error')}")
-                            except:
-                                raise Exception(f"Upload failed with status {resp.status}")
-                        
+            LOGGER.info("Starting file upload...")
+            result = await self.dluploader.upload_aiohttp(
+                upload_url,
+                file_info.path,
+                None,  # No req_file needed for PUT
+                {},     # No data needed for PUT
+                headers=headers,
+                method='PUT',
+                file_size=file_info.size
+            )
 
-                        if resp.status == 201:
-                            response_text = await resp.text()
-                            try:
-                                import json
-                                json_response = json.loads(response_text)
-                                file_id = json_response.get('id')
-                                if file_id:
-                                    download_url = f"https://pixeldrain.com/u/{file_id}"
-                                    return {"downloadPage": download_url}
-                            except json.JSONDecodeError:
-                                # If not JSON, treat as plain text
-                                file_id = response_text.strip().strip('"')
-                                if file_id:
-                                    download_url = f"https://pixeldrain.com/u/{file_id}"
-                                    return {"downloadPage": download_url}
-                            
-                            raise Exception("Could not extract file ID from response")
+            # PixelDrain answers with {"id": ...}, older responses are just the quoted id
+            if isinstance(result, dict):
+                file_id = result.get('id')
+            else:
+                file_id = result.strip().strip('"') if result else None
+            if file_id:
+                download_url = f"https://pixeldrain.com/u/{file_id}"
+                return {"downloadPage": download_url}
 
-                        LOGGER.error(f"Upload failed - unexpected response status: {resp.status}")
-                        raise Exception("Upload failed - unexpected response status")
+            raise Exception("Could not extract file ID from response")
 
         except Exception as e:
             LOGGER.error(f"Error uploading to PixelDrain: {str(e)}")
             raise
 
-    async def upload(self, file_path):
+    async def upload(self, file_info):
         """Main upload method"""
-        LOGGER.info(f"PixelDrain upload called for: {file_path}")
-        
-        # Add exists check logging
-        exists = await aiopath.exists(file_path)
-        LOGGER.info(f"File exists check: {exists}")
-        
-        # Add isfile check logging
-        is_file = await aiopath.isfile(file_path)
-        LOGGER.info(f"Is file check: {is_file}")
-        
-        # Add isdir check for debugging
-        is_dir = await aiopath.isdir(file_path)
-        LOGGER.info(f"Is directory check: {is_dir}")
+        LOGGER.info(f"PixelDrain upload called for: {file_info.path}")
         
-        if exists and not is_dir:
-            LOGGER.info("File verification passed (exists and not directory), proceeding with upload...")
-            result = await self.upload_file(file_path)
+        if file_info.is_file:
+            result = await self.upload_file(file_info)
             LOGGER.info(f"Upload result: {result}")
             if result and result.get('downloadPage'):
                 return result['downloadPage']  # Return direct URL for DDLEngine
         else:
-            LOGGER.error(f"File verification failed - Path: {file_path}")
-            LOGGER.error(f"File exists: {exists}, Is file: {is_file}, Is directory: {is_dir}")
+            LOGGER.error(f"File verification failed - Path: {file_info.path}")
             raise Exception("Cannot upload: Path is not a file!")
         
         if self.dluploader.is_cancelled:
@@ -1,10 +1,5 @@
 #!/usr/bin/env python3
-from os import path as ospath
-from aiofiles.os import path as aiopath, stat as aiostat
-from aiohttp import ClientSession, FormData
-import asyncio
-import aiofiles
-import json
+from orjson import loads as json_loads, JSONDecodeError
 
 from bot import LOGGER
 
@@ -14,19 +9,15 @@ class Ranoz:
         self.dluploader = dluploader
         LOGGER.info("Ranoz initialized successfully")
 
-    async def upload_file(self, file_path):
+    async def upload_file(self, file_info):
         """Upload a single file to Ranoz using two-step process"""
-        LOGGER.info(f"Starting Ranoz upload for: {file_path}")
-        if not await aiopath.exists(file_path):
-            raise Exception(f"File not found: {file_path}")
-        
+        LOGGER.info(f"Starting Ranoz upload for: {file_info.path}")
         if self.dluploader.is_cancelled:
             LOGGER.info("Upload cancelled by user")
             return
 
-        file_name = ospath.basename(file_path)
-        file_stat = await aiostat(file_path)
-        file_size = file_stat.st_size
+        file_name = file_info.name
+        file_size = file_info.size
         
         LOGGER.info(f"Uploading file: {file_name} ({file_size} bytes)")
         
@@ -41,58 +32,55 @@ class Ranoz:
             LOGGER.info("Using two-step upload process for better memory efficiency...")
             
             # Step 1: Get pre-signed upload URL
-            async with ClientSession() as session:
-                headers = {
-                    'Content-Type': 'application/json'
-                }
-                
-                file_metadata = {
-                    'filename': file_name,
-                    'size': file_size
-                }
+            session = await self.dluploader.get_session()
+            headers = {
+                'Content-Type': 'application/json'
+            }
+            
+            file_metadata = {
+                'filename': file_name,
+                'size': file_size
+            }
+            
+            upload_url_endpoint = f"{self.api_url}/files/upload_url"
+            LOGGER.info(f"Requesting upload URL from: {upload_url_endpoint}")
+            
+            async with session.post(upload_url_endpoint, json=file_metadata, headers=headers) as resp:
+                if resp.status != 200:
+                    error_text = await resp.text()
+                    LOGGER.error(f"Failed to get upload URL: {resp.status} - {error_text}")
+                    raise Exception(f"Failed to get upload URL: {resp.status}")
                 
-                upload_url_endpoint = f"{self.api_url}/files/upload_url"
-                LOGGER.info(f"Requesting upload URL from: {upload_url_endpoint}")
+                content_type = resp.headers.get('content-type', '')
+                LOGGER.info(f"Response content-type: {content_type}")
                 
-                async with session.post(upload_url_endpoint, json=file_metadata, headers=headers) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        LOGGER.error(f"Failed to get upload URL: {resp.status} - {error_text}")
-                        raise Exception(f"Failed to get upload URL: {resp.status}")
+                # Try to parse as JSON regardless of content-type (API returns JSON with text/plain header)
+                try:
+                    response_data = json_loads(await resp.read())
+                    LOGGER.info(f"Upload URL response parsed successfully: {response_data}")
                     
-                    # Check content type before attempting JSON decode
-                    content_type = resp.headers.get('content-type', '')
-                    response_text = await resp.text()
-                    LOGGER.info(f"Response content-type: {content_type}")
-                    LOGGER.info(f"Response text: {response_text}")
+                    if not response_data.get('data'):
+                        raise Exception("No data in upload URL response")
+                    
+                    upload_url = response_data['data'].get('upload_url')
+                    file_data = response_data['data']
                     
-                    # Try to parse as JSON regardless of content-type (API returns JSON with text/plain header)
-                    try:
-                        response_data = json.loads(response_text)
-                        LOGGER.info(f"Upload URL response parsed successfully: {response_data}")
-                        
-                        if not response_data.get('data'):
-                            raise Exception("No data in upload URL response")
-                        
-                        upload_url = response_data['data'].get('upload_url')
-                        file_data = response_data['data']
-                        
-                        if not upload_url:
-                            raise Exception("No upload URL in response")
-                    except json.JSONDecodeError:
-                        # If not JSON, treat as plain text response (might be the upload URL directly)
-                        if response_text.startswith('http'):
-                            upload_url = response_text.strip()
-                            file_data = {'upload_url': upload_url}
-                        else:
-                            raise Exception(f"Failed to parse response. Content-Type: {content_type}, Response: {response_text}")
+                    if not upload_url:
+                        raise Exception("No upload URL in response")
+                except JSONDecodeError:
+                    # If not JSON, treat as plain text response (might be the upload URL directly)
+                    response_text = await resp.text()
+                    if response_text.startswith('http'):
+                        upload_url = response_text.strip()
+                        file_data = {'upload_url': upload_url}
+                    else:
+                        raise Exception(f"Failed to parse response. Content-Type: {content_type}, Response: {response_text}")
             
             # Step 2: Upload file to pre-signed URL
             if self.dluploader.is_cancelled:
                 return
                 
             LOGGER.info(f"Uploading to pre-signed URL: {upload_url}")
-            self.dluploader.last_uploaded = 0
             
             # Use PUT method with Content-Length header
             put_headers = {
@@ -101,11 +89,12 @@ class Ranoz:
             
             result = await self.dluploader.upload_aiohttp(
                 upload_url,
-                file_path,
+                file_info.path,
                 None,  # No form field name needed for PUT
                 {},    # No additional data needed
                 headers=put_headers,
-                method='PUT'
+                method='PUT',
+                file_size=file_size
             )
             
             # For PUT request, success is indicated by status code, not response content
@@ -132,18 +121,12 @@ class Ranoz:
             LOGGER.error(f"Error uploading to Ranoz: {str(e)}")
             raise
 
-    async def upload(self, file_path):
+    async def upload(self, file_info):
         """Main upload method"""
-        LOGGER.info(f"Ranoz upload called for: {file_path}")
-        
-        # Add debugging for file detection
-        exists = await aiopath.exists(file_path)
-        is_file = await aiopath.isfile(file_path)
-        is_dir = await aiopath.isdir(file_path)
-        LOGGER.info(f"Ranoz file checks - Exists: {exists}, Is file: {is_file}, Is directory: {is_dir}")
+        LOGGER.info(f"Ranoz upload called for: {file_info.path}")
         
-        if exists and not is_dir:
-            result = await self.upload_file(file_path)
+        if file_info.is_file:
+            result = await self.upload_file(file_info)
             LOGGER.info(f"Upload result: {result}")
             if result and result.get('downloadPage'):
                 return result['downloadPage']  # Return direct URL for DDLEngine
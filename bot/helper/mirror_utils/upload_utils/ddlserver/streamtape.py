@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
 from pathlib import Path
 
-from aiofiles.os import scandir, path as aiopath
-from aiofiles import open as aiopen
+from aiofiles.os import scandir
 from aiohttp import ClientSession
 
 from bot import config_dict, LOGGER
@@ -43,7 +42,7 @@ class Streamtape:
                         return data["result"]
         return None
 
-    async def upload_file(self, file_path, folder_id=None, sha256=None, httponly=False):
+    async def upload_file(self, file_path, folder_id=None, sha256=None, httponly=False, file_size=None):
         if Path(file_path).suffix.lower() not in ALLOWED_EXTS:
             return f"Skipping '{file_path}' due to disallowed extension."
         file_name = Path(file_path).name
@@ -57,8 +56,7 @@ class Streamtape:
             return None
         if self.dluploader.is_cancelled:
             return
-        self.dluploader.last_uploaded = 0
-        uploaded = await self.dluploader.upload_aiohttp(upload_info["url"], file_path, file_name, {})
+        uploaded = await self.dluploader.upload_aiohttp(upload_info["url"], file_path, file_name, {}, file_size=file_size)
         if uploaded:
             file_id = (await self.list_folder(folder=folder_id))['files'][0]['linkid']
             await self.rename(file_id, file_name)
@@ -133,12 +131,12 @@ class Streamtape:
             return await self.list_telegraph(newfid)
         return None
         
-    async def upload(self, file_path):
+    async def upload(self, file_info):
         stlink = None
-        if await aiopath.isfile(file_path):
-            stlink = await self.upload_file(file_path)
-        elif await aiopath.isdir(file_path):
-            stlink = await self.upload_folder(file_path)
+        if file_info.is_file:
+            stlink = await self.upload_file(file_info.path, file_size=file_info.size)
+        else:
+            stlink = await self.upload_folder(file_info.path)
         if stlink:
             return stlink
         if self.dluploader.is_cancelled:
@@ -1,14 +0,0 @@
-from io import BufferedReader
-from pathlib import Path
-
-class ProgressFileReader(BufferedReader):
-    def __init__(self, filename, read_callback=None):
-        super().__init__(open(filename, "rb"))
-        self.__read_callback = read_callback
-        self.length = Path(filename).stat().st_size
-        
-    def read(self, size=None):
-        size = size or (self.length - self.tell())
-        if self.__read_callback:
-            self.__read_callback(self.tell())
-        return super().read(size)
\ No newline at end of file
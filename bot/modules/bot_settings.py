@@ -38,6 +38,7 @@ default_values = {'AUTO_DELETE_MESSAGE_DURATION': 30,
                   'RSS_DELAY': 600,
                   'STATUS_UPDATE_INTERVAL': 10,
                   'SEARCH_LIMIT': 0,
+                  'DDL_UPLOAD_CONCURRENCY': 4,
                   'UPSTREAM_BRANCH': 'master',
                   'BOT_THEME': 'minimal',
                   'BOT_LANG': 'en',
@@ -278,6 +279,9 @@ async def load_config():
     QUEUE_UPLOAD = environ.get('QUEUE_UPLOAD', '')
     QUEUE_UPLOAD = '' if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+    DDL_UPLOAD_CONCURRENCY = environ.get('DDL_UPLOAD_CONCURRENCY', '')
+    DDL_UPLOAD_CONCURRENCY = 4 if len(DDL_UPLOAD_CONCURRENCY) == 0 else int(DDL_UPLOAD_CONCURRENCY)
+
     INCOMPLETE_TASK_NOTIFIER = environ.get('INCOMPLETE_TASK_NOTIFIER', '')
     INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == 'true'
     if not INCOMPLETE_TASK_NOTIFIER and DATABASE_URL:
@@ -660,6 +664,7 @@ async def load_config():
                         'QUEUE_ALL': QUEUE_ALL,
                         'QUEUE_DOWNLOAD': QUEUE_DOWNLOAD,
                         'QUEUE_UPLOAD': QUEUE_UPLOAD,
+                        'DDL_UPLOAD_CONCURRENCY': DDL_UPLOAD_CONCURRENCY,
                         'RCLONE_FLAGS': RCLONE_FLAGS,
                         'RCLONE_PATH': RCLONE_PATH,
                         'RCLONE_SERVE_URL': RCLONE_SERVE_URL,